@@ -4,29 +4,47 @@ import asyncio
 import logging
 import os
 from dotenv import load_dotenv
-from .config import load_config, load_styles
-from .quote import PriceQuoteCache
+from .config import load_config, load_styles, ConfigWriter
+from .utils import setup_logging
+from .quote import close_all_sessions
 from .commands import CommandHandler
 from .updaters import VoiceChannelUpdater, MessageTickerUpdater
 
 logger = logging.getLogger(__name__)
 
+class _Client(discord.Client):
+    """Client that flushes state and closes the shared HTTP sessions on
+    actual shutdown.
+
+    on_disconnect fires on every transient gateway drop and would tear
+    down the keep-alive connections mid-tick; close() only runs when the
+    client is really going away."""
+    def __init__(self, config_writer, **kwargs):
+        super().__init__(**kwargs)
+        self.config_writer = config_writer
+
+    async def close(self):
+        # Land any config changes still sitting in the debounce window
+        # before the process goes away
+        await self.config_writer.flush()
+        await close_all_sessions()
+        await super().close()
+
 class CryptoPriceBot:
-    def __init__(self, config, styles, price_quoter):
+    def __init__(self, config, styles, price_quoter=None):
         self.config = config
         self.styles = styles
         self.price_quoter = price_quoter
         
         # Initialize Discord client
         intents = discord.Intents.default()
-        self.client = discord.Client(intents=intents)
+        self.config_writer = ConfigWriter(self.config)
+        self.client = _Client(self.config_writer, intents=intents)
         self.tree = app_commands.CommandTree(self.client)
-        
-        # Initialize components
         self.voice_updater = VoiceChannelUpdater(self.client, self.config, self.styles, self.price_quoter)
         self.message_updater = MessageTickerUpdater(self.client, self.config, self.price_quoter)
         self.command_handler = CommandHandler(
-            self.client, self.tree, self.config, self.price_quoter, 
+            self.client, self.tree, self.config, self.config_writer, self.price_quoter,
             self.voice_updater, self.message_updater
         )
         
@@ -39,9 +57,10 @@ class CryptoPriceBot:
             await self.tree.sync()
             logger.info(f"{self.client.user} ready.")
             
-            # Start update loops
+            # Start update loops and the config writer
             self.client.loop.create_task(self.voice_updater.update_loop())
             self.client.loop.create_task(self.message_updater.update_loop())
+            self.client.loop.create_task(self.config_writer.run())
         
         @self.client.event
         async def on_disconnect():
@@ -52,13 +71,9 @@ class CryptoPriceBot:
 
 def main():
     """Main entry point for the bot."""
-    # Configure logging
-    logging.basicConfig(
-        format='%(asctime)s.%(msecs)03d %(name)-6s:[%(levelname)-8s] %(message)s',
-        datefmt='%Y-%m-%dT%H:%M:%S',
-        level=logging.INFO
-    )
-    
+    # Configure logging (queue-backed so handler I/O stays off the event loop)
+    setup_logging()
+
     load_dotenv()
     discord_token = os.getenv("DISCORD_BOT_TOKEN")
     
@@ -69,9 +84,8 @@ def main():
     # Initialize and run bot
     config = load_config()
     styles = load_styles()
-    price_quoter = PriceQuoteCache("dummy_key")
-    
-    bot = CryptoPriceBot(config, styles, price_quoter)
+
+    bot = CryptoPriceBot(config, styles)
     bot.run(discord_token)
 
 if __name__ == "__main__":
@@ -1,22 +1,85 @@
+import asyncio
+import sys
 import discord
 from discord import app_commands
+import functools
 import logging
 from datetime import datetime
-from .config import Configuration, GuildConfiguration, save_config
-from .quote import PriceQuoteCache
+from enum import IntEnum
+from .config import Configuration, GuildConfiguration
+from .quote import get_quoter, discard_quoter
 from .permissions import is_server_admin, has_bot_management_permission, get_management_role_name
 
 logger = logging.getLogger(__name__)
 
+# Coalescing window and batch cap for ticker validation requests
+VALIDATE_WINDOW = 0.05
+VALIDATE_BATCH_LIMIT = 64
+
+def norm(ticker: str) -> str:
+    """Normalize a ticker symbol: uppercase and interned, so the repeat
+    symbols used as dict keys share one string object with a cached hash"""
+    return sys.intern(ticker.upper())
+
+class CheckResult(IntEnum):
+    OK = 0
+    NO_PERM = 1
+    NO_API = 2
+    NO_ADMIN = 3
+
+# Pre-built ephemeral replies for each failed check
+_CHECK_MESSAGES = {
+    CheckResult.NO_PERM: "Bot management permissions required.",
+    CheckResult.NO_API: "Set API key first with /set_cmc_api_key",
+    CheckResult.NO_ADMIN: "Administrator permissions required.",
+}
+
+def requires(admin=False, perm=True, api=True):
+    """Wrap a command method so the standard checks run once up front
+    and short-circuit with a pre-built ephemeral reply on failure"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, interaction, *args, **kwargs):
+            result = self._check(interaction, admin, perm, api)
+            if result:
+                await interaction.response.send_message(_CHECK_MESSAGES[result], ephemeral=True)
+                return
+            return await fn(self, interaction, *args, **kwargs)
+        return wrapper
+    return decorator
+
 class CommandHandler:
-    def __init__(self, client, tree, config, price_quoter, voice_updater, message_updater):
+    # Reply templates shared by the ticker commands; built once instead of
+    # formatting a fresh f-string on every interaction
+    _MSG_TICKER_NOT_FOUND = "Ticker {} not found."
+    _MSG_NOT_TRACKED = "{} not tracked."
+    _MSG_ALREADY_TRACKED = "{} already tracked."
+    _MSG_ADDED_VOICE = "Added {} to voice updates."
+    _MSG_REMOVED_VOICE = "Removed {} from voice updates."
+    _MSG_ADDED_CHANNEL = "Added {} to <#{}>"
+    _MSG_REMOVED_MESSAGE = "Removed {} from messages."
+    _MSG_ADDED_RATIO = "Added {}:{} to <#{}>"
+    _MSG_REMOVED_RATIO = "Removed {}:{} from ratios."
+    _MSG_RATIO_NOT_TRACKED = "Ratio {}:{} not tracked."
+
+    def __init__(self, client, tree, config, config_writer, price_quoter, voice_updater, message_updater):
         self.client = client
         self.tree = tree
         self.config = config
+        self.config_writer = config_writer
         self.price_quoter = price_quoter
         self.voice_updater = voice_updater
         self.message_updater = message_updater
-    
+        self._validate_pending = {}
+        # Per-guild config version and the embed rendered for it
+        self._settings_version = {}
+        self._settings_embed_cache = {}
+
+    def _save(self, guild_id):
+        """Persist a guild's config and invalidate cached renderings"""
+        self._settings_version[guild_id] = self._settings_version.get(guild_id, 0) + 1
+        self.config_writer.save(guild_id)
+
     def _get_or_create_guild(self, guild_id):
         """Get or create guild configuration"""
         guild = self.config.guilds.get(guild_id)
@@ -24,357 +87,327 @@ class CommandHandler:
             guild = GuildConfiguration(id=guild_id)
             self.config.guilds[guild_id] = guild
         return guild
-    
+
     async def _validate_api_key(self, api_key):
         """Validate CoinMarketCap API key"""
-        test_quoter = PriceQuoteCache(api_key)
         try:
-            test_data = await test_quoter.fetch_no_cache(["BTC"])
-            return bool(test_data)
+            test_data = await get_quoter(api_key).fetch_no_cache(["BTC"])
+            valid = bool(test_data)
         except Exception:
-            return False
+            valid = False
+        if not valid and not any(g.cmc_api_key == api_key for g in self.config.guilds.values()):
+            # Don't let a rejected user-typed key keep a quoter and open
+            # session cached in the shared registries
+            await discard_quoter(api_key)
+        return valid
+
+    async def _fetch_validated(self, tickers, api_key):
+        """Fetch quotes for tickers, coalescing concurrent validations for the
+        same API key into a single CMC request.
+
+        The first caller becomes the batch leader: it waits a short window for
+        other coroutines to join the pending set, then issues one request for
+        the union and publishes the results. Followers just wait on the event.
+        Returns a dict of symbol -> quote for every symbol CMC recognized.
+        """
+        pending = self._validate_pending.get(api_key)
+        if pending is not None and len(pending[2]) < VALIDATE_BATCH_LIMIT:
+            # Join an in-flight batch
+            event, results, symbols = pending
+            symbols.update(tickers)
+            await event.wait()
+            return results
+
+        # Lead a new batch
+        batch = (asyncio.Event(), {}, set(tickers))
+        event, results, symbols = batch
+        self._validate_pending[api_key] = batch
+        await asyncio.sleep(VALIDATE_WINDOW)
+        # If our batch overflowed, a second leader has already replaced the
+        # pending entry with its own; only remove the entry while it is ours
+        if self._validate_pending.get(api_key) is batch:
+            del self._validate_pending[api_key]
+        try:
+            quotes = await get_quoter(api_key).fetch_no_cache(list(symbols))
+            results.update({quote.symbol: quote for quote in quotes})
         finally:
-            await test_quoter.close()
-    
+            event.set()
+        return results
+
     async def _validate_ticker(self, ticker, api_key):
         """Validate ticker exists on CoinMarketCap"""
-        guild_quoter = PriceQuoteCache(api_key)
-        try:
-            crypto_data = await guild_quoter.fetch_no_cache([ticker])
-            return bool(crypto_data)
-        finally:
-            await guild_quoter.close()
-    
-    def _check_permissions_and_api(self, interaction):
-        """Check permissions and API key availability"""
-        if not has_bot_management_permission(interaction, self.config):
-            return "permissions"
-        
-        guild = self.config.guilds.get(interaction.guild_id)
-        if not guild or not guild.cmc_api_key:
-            return "api_key"
-        
-        return "ok"
-    
-    def register_commands(self):
-        """Register all slash commands"""
-        
-        @self.tree.command(name="set_cmc_api_key", description="Set CoinMarketCap API key (Admin only)")
-        async def set_cmc_api_key(interaction: discord.Interaction, api_key: str):
-            if not is_server_admin(interaction):
-                await interaction.response.send_message("Administrator permissions required.", ephemeral=True)
-                return
-            
-            if not await self._validate_api_key(api_key):
-                await interaction.response.send_message("Invalid API key.", ephemeral=True)
-                return
-            
-            guild = self._get_or_create_guild(interaction.guild_id)
-            guild.cmc_api_key = api_key
-            save_config(self.config)
-            
-            await interaction.response.send_message("API key set successfully.", ephemeral=True)
-        
-        @self.tree.command(name="remove_cmc_api_key", description="Remove CoinMarketCap API key (Admin only)")
-        async def remove_cmc_api_key(interaction: discord.Interaction):
-            if not is_server_admin(interaction):
-                await interaction.response.send_message("Administrator permissions required.", ephemeral=True)
-                return
-            
+        by_symbol = await self._fetch_validated([ticker], api_key)
+        return ticker in by_symbol
+
+    def _check(self, interaction, admin, perm, api) -> CheckResult:
+        """Run the requested permission/API-key checks for an interaction"""
+        if admin and not is_server_admin(interaction):
+            return CheckResult.NO_ADMIN
+
+        if perm and not has_bot_management_permission(interaction, self.config):
+            return CheckResult.NO_PERM
+
+        if api:
             guild = self.config.guilds.get(interaction.guild_id)
-            if guild and guild.cmc_api_key:
-                guild.cmc_api_key = None
-                save_config(self.config)
-                await interaction.response.send_message("API key removed.", ephemeral=True)
-            else:
-                await interaction.response.send_message("No API key set.", ephemeral=True)
-        
-        @self.tree.command(name="set_bot_management_role", description="Set bot management role (Admin only)")
-        async def set_bot_management_role(interaction: discord.Interaction, role: discord.Role):
-            if not is_server_admin(interaction):
-                await interaction.response.send_message("Administrator permissions required.", ephemeral=True)
+            if not guild or not guild.cmc_api_key:
+                return CheckResult.NO_API
+
+        return CheckResult.OK
+
+    def register_commands(self):
+        """Register all slash commands as bound methods"""
+        command = self.tree.command
+
+        command(name="set_cmc_api_key", description="Set CoinMarketCap API key (Admin only)")(self._cmd_set_cmc_api_key)
+        command(name="remove_cmc_api_key", description="Remove CoinMarketCap API key (Admin only)")(self._cmd_remove_cmc_api_key)
+        command(name="set_bot_management_role", description="Set bot management role (Admin only)")(self._cmd_set_bot_management_role)
+        command(name="remove_bot_management_role", description="Remove bot management role (Admin only)")(self._cmd_remove_bot_management_role)
+        command(name="set_voice_update_category", description="Set voice channel category")(self._cmd_set_voice_update_category)
+        command(name="add_voice_ticker", description="Add voice channel ticker")(self._cmd_add_voice_ticker)
+        command(name="remove_voice_ticker", description="Remove voice channel ticker")(self._cmd_remove_voice_ticker)
+        command(name="add_message_ticker", description="Add message ticker")(self._cmd_add_message_ticker)
+        command(name="remove_message_ticker", description="Remove message ticker")(self._cmd_remove_message_ticker)
+        command(name="add_message_ratio_tickers", description="Add ratio ticker")(self._cmd_add_message_ratio_tickers)
+        command(name="remove_message_ratio_tickers", description="Remove ratio ticker")(self._cmd_remove_message_ratio_tickers)
+        command(name="force_update_tickers", description="Force update voice channels")(self._cmd_force_update_tickers)
+        command(name="force_update_message_tickers", description="Force update message tickers")(self._cmd_force_update_message_tickers)
+        command(name="force_update_ratio_tickers", description="Force update ratio tickers")(self._cmd_force_update_ratio_tickers)
+        command(name="show_settings", description="Show bot settings")(self._cmd_show_settings)
+
+    @requires(admin=True, perm=False, api=False)
+    async def _cmd_set_cmc_api_key(self, interaction: discord.Interaction, api_key: str):
+        if not await self._validate_api_key(api_key):
+            await interaction.response.send_message("Invalid API key.", ephemeral=True)
+            return
+
+        guild = self._get_or_create_guild(interaction.guild_id)
+        guild.cmc_api_key = api_key
+        self._save(interaction.guild_id)
+
+        await interaction.response.send_message("API key set successfully.", ephemeral=True)
+
+    @requires(admin=True, perm=False, api=False)
+    async def _cmd_remove_cmc_api_key(self, interaction: discord.Interaction):
+        guild = self.config.guilds.get(interaction.guild_id)
+        if guild and guild.cmc_api_key:
+            guild.cmc_api_key = None
+            self._save(interaction.guild_id)
+            await interaction.response.send_message("API key removed.", ephemeral=True)
+        else:
+            await interaction.response.send_message("No API key set.", ephemeral=True)
+
+    @requires(admin=True, perm=False, api=False)
+    async def _cmd_set_bot_management_role(self, interaction: discord.Interaction, role: discord.Role):
+        guild = self._get_or_create_guild(interaction.guild_id)
+        guild.management_role_id = role.id
+        self._save(interaction.guild_id)
+
+        await interaction.response.send_message(f"Management role set to **{role.name}**.", ephemeral=True)
+
+    @requires(admin=True, perm=False, api=False)
+    async def _cmd_remove_bot_management_role(self, interaction: discord.Interaction):
+        guild = self.config.guilds.get(interaction.guild_id)
+        if guild and guild.management_role_id:
+            old_role = interaction.guild.get_role(guild.management_role_id)
+            role_name = old_role.name if old_role else "Unknown Role"
+            guild.management_role_id = None
+            self._save(interaction.guild_id)
+            await interaction.response.send_message(f"Removed **{role_name}** as management role.", ephemeral=True)
+        else:
+            await interaction.response.send_message("No management role set.", ephemeral=True)
+
+    @requires()
+    async def _cmd_set_voice_update_category(self, interaction: discord.Interaction, category_id: str):
+        try:
+            category_id = int(category_id)
+            channel = interaction.guild.get_channel(category_id)
+            category = channel if isinstance(channel, discord.CategoryChannel) else None
+            if not category:
+                await interaction.response.send_message("Category not found.", ephemeral=True)
                 return
-            
+
             guild = self._get_or_create_guild(interaction.guild_id)
-            guild.management_role_id = role.id
-            save_config(self.config)
-            
-            await interaction.response.send_message(f"Management role set to **{role.name}**.", ephemeral=True)
-        
-        @self.tree.command(name="remove_bot_management_role", description="Remove bot management role (Admin only)")
-        async def remove_bot_management_role(interaction: discord.Interaction):
-            if not is_server_admin(interaction):
-                await interaction.response.send_message("Administrator permissions required.", ephemeral=True)
-                return
-            
-            guild = self.config.guilds.get(interaction.guild_id)
-            if guild and guild.management_role_id:
-                old_role = discord.utils.get(interaction.guild.roles, id=guild.management_role_id)
-                role_name = old_role.name if old_role else "Unknown Role"
-                guild.management_role_id = None
-                save_config(self.config)
-                await interaction.response.send_message(f"Removed **{role_name}** as management role.", ephemeral=True)
-            else:
-                await interaction.response.send_message("No management role set.", ephemeral=True)
-        
-        @self.tree.command(name="set_voice_update_category", description="Set voice channel category")
-        async def set_voice_update_category(interaction: discord.Interaction, category_id: str):
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            elif check == "api_key":
-                await interaction.response.send_message("Set API key first with /set_cmc_api_key", ephemeral=True)
-                return
-            
-            try:
-                category_id = int(category_id)
-                category = discord.utils.get(interaction.guild.categories, id=category_id)
-                if not category:
-                    await interaction.response.send_message("Category not found.", ephemeral=True)
-                    return
-                
-                guild = self._get_or_create_guild(interaction.guild_id)
-                guild.update_category = category_id
-                guild.voice_tickers = []
-                save_config(self.config)
-                
-                await interaction.response.send_message(f"Update category set to {category.name}", ephemeral=True)
-            except ValueError:
-                await interaction.response.send_message("Invalid category ID.", ephemeral=True)
-        
-        @self.tree.command(name="add_voice_ticker", description="Add voice channel ticker")
-        async def add_voice_ticker(interaction: discord.Interaction, ticker: str):
-            await interaction.response.defer(ephemeral=True)
-            
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.followup.send("Bot management permissions required.", ephemeral=True)
-                return
-            elif check == "api_key":
-                await interaction.followup.send("Set API key first with /set_cmc_api_key", ephemeral=True)
-                return
-            
-            ticker = ticker.upper()
-            guild = self.config.guilds.get(interaction.guild_id)
-            
-            if not guild.update_category:
-                await interaction.followup.send("Set update category first with /set_voice_update_category", ephemeral=True)
+            guild.update_category = category_id
+            guild.voice_tickers = {}
+            self._save(interaction.guild_id)
+
+            await interaction.response.send_message(f"Update category set to {category.name}", ephemeral=True)
+        except ValueError:
+            await interaction.response.send_message("Invalid category ID.", ephemeral=True)
+
+    @requires()
+    async def _cmd_add_voice_ticker(self, interaction: discord.Interaction, ticker: str):
+        await interaction.response.defer(ephemeral=True)
+
+        ticker = norm(ticker)
+        guild = self.config.guilds.get(interaction.guild_id)
+
+        if not guild.update_category:
+            await interaction.followup.send("Set update category first with /set_voice_update_category", ephemeral=True)
+            return
+
+        if not await self._validate_ticker(ticker, guild.cmc_api_key):
+            await interaction.followup.send(self._MSG_TICKER_NOT_FOUND.format(ticker), ephemeral=True)
+            return
+
+        if ticker not in guild.voice_tickers:
+            guild.voice_tickers[ticker] = None
+            self._save(interaction.guild_id)
+            # Use the new optimized method to add just this ticker
+            await self.voice_updater.add_voice_ticker(interaction.guild_id, ticker)
+            await interaction.followup.send(self._MSG_ADDED_VOICE.format(ticker), ephemeral=True)
+        else:
+            await interaction.followup.send(self._MSG_ALREADY_TRACKED.format(ticker), ephemeral=True)
+
+    @requires(api=False)
+    async def _cmd_remove_voice_ticker(self, interaction: discord.Interaction, ticker: str):
+        ticker = norm(ticker)
+        guild = self.config.guilds.get(interaction.guild_id)
+
+        if guild and ticker in guild.voice_tickers:
+            del guild.voice_tickers[ticker]
+            self._save(interaction.guild_id)
+            # Use the new optimized method to remove just this ticker
+            await self.voice_updater.remove_voice_ticker(interaction.guild_id, ticker)
+            await interaction.response.send_message(self._MSG_REMOVED_VOICE.format(ticker), ephemeral=True)
+        else:
+            await interaction.response.send_message(self._MSG_NOT_TRACKED.format(ticker), ephemeral=True)
+
+    @requires()
+    async def _cmd_add_message_ticker(self, interaction: discord.Interaction, ticker: str, channel_id: str):
+        ticker = norm(ticker)
+        guild = self.config.guilds.get(interaction.guild_id)
+
+        try:
+            channel_id = int(channel_id)
+            if not self.client.get_channel(channel_id):
+                await interaction.response.send_message("Channel not found.", ephemeral=True)
                 return
-            
+
             if not await self._validate_ticker(ticker, guild.cmc_api_key):
-                await interaction.followup.send(f"Ticker {ticker} not found.", ephemeral=True)
-                return
-            
-            if ticker not in guild.voice_tickers:
-                guild.voice_tickers.append(ticker)
-                save_config(self.config)
-                # Use the new optimized method to add just this ticker
-                await self.voice_updater.add_voice_ticker(interaction.guild_id, ticker)
-                await interaction.followup.send(f"Added {ticker} to voice updates.", ephemeral=True)
-            else:
-                await interaction.followup.send(f"{ticker} already tracked.", ephemeral=True)
-        
-        @self.tree.command(name="remove_voice_ticker", description="Remove voice channel ticker")
-        async def remove_voice_ticker(interaction: discord.Interaction, ticker: str):
-            if not has_bot_management_permission(interaction, self.config):
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            
-            ticker = ticker.upper()
-            guild = self.config.guilds.get(interaction.guild_id)
-            
-            if guild and ticker in guild.voice_tickers:
-                guild.voice_tickers.remove(ticker)
-                save_config(self.config)
-                # Use the new optimized method to remove just this ticker
-                await self.voice_updater.remove_voice_ticker(interaction.guild_id, ticker)
-                await interaction.response.send_message(f"Removed {ticker} from voice updates.", ephemeral=True)
-            else:
-                await interaction.response.send_message(f"{ticker} not tracked.", ephemeral=True)
-        
-        @self.tree.command(name="add_message_ticker", description="Add message ticker")
-        async def add_message_ticker(interaction: discord.Interaction, ticker: str, channel_id: str):
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
+                await interaction.response.send_message(self._MSG_TICKER_NOT_FOUND.format(ticker), ephemeral=True)
                 return
-            elif check == "api_key":
-                await interaction.response.send_message("Set API key first with /set_cmc_api_key", ephemeral=True)
-                return
-            
-            ticker = ticker.upper()
-            guild = self.config.guilds.get(interaction.guild_id)
-            
-            try:
-                channel_id = int(channel_id)
-                if not self.client.get_channel(channel_id):
-                    await interaction.response.send_message("Channel not found.", ephemeral=True)
-                    return
-                
-                if not await self._validate_ticker(ticker, guild.cmc_api_key):
-                    await interaction.response.send_message(f"Ticker {ticker} not found.", ephemeral=True)
-                    return
-                
-                guild.message_tickers[ticker] = channel_id
-                save_config(self.config)
-                await interaction.response.send_message(f"Added {ticker} to <#{channel_id}>", ephemeral=True)
-            except ValueError:
-                await interaction.response.send_message("Invalid channel ID.", ephemeral=True)
-        
-        @self.tree.command(name="remove_message_ticker", description="Remove message ticker")
-        async def remove_message_ticker(interaction: discord.Interaction, ticker: str):
-            if not has_bot_management_permission(interaction, self.config):
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            
-            ticker = ticker.upper()
-            guild = self.config.guilds.get(interaction.guild_id)
-            
-            if guild and ticker in guild.message_tickers:
-                del guild.message_tickers[ticker]
-                save_config(self.config)
-                await interaction.response.send_message(f"Removed {ticker} from messages.", ephemeral=True)
-            else:
-                await interaction.response.send_message(f"{ticker} not tracked.", ephemeral=True)
-        
-        @self.tree.command(name="add_message_ratio_tickers", description="Add ratio ticker")
-        async def add_message_ratio_tickers(interaction: discord.Interaction, ticker1: str, ticker2: str, channel_id: str):
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            elif check == "api_key":
-                await interaction.response.send_message("Set API key first with /set_cmc_api_key", ephemeral=True)
+
+            guild.message_tickers[ticker] = channel_id
+            self._save(interaction.guild_id)
+            await interaction.response.send_message(self._MSG_ADDED_CHANNEL.format(ticker, channel_id), ephemeral=True)
+        except ValueError:
+            await interaction.response.send_message("Invalid channel ID.", ephemeral=True)
+
+    @requires(api=False)
+    async def _cmd_remove_message_ticker(self, interaction: discord.Interaction, ticker: str):
+        ticker = norm(ticker)
+        guild = self.config.guilds.get(interaction.guild_id)
+
+        if guild and ticker in guild.message_tickers:
+            del guild.message_tickers[ticker]
+            self._save(interaction.guild_id)
+            await interaction.response.send_message(self._MSG_REMOVED_MESSAGE.format(ticker), ephemeral=True)
+        else:
+            await interaction.response.send_message(self._MSG_NOT_TRACKED.format(ticker), ephemeral=True)
+
+    @requires()
+    async def _cmd_add_message_ratio_tickers(self, interaction: discord.Interaction, ticker1: str, ticker2: str, channel_id: str):
+        ticker1, ticker2 = norm(ticker1), norm(ticker2)
+        guild = self.config.guilds.get(interaction.guild_id)
+
+        try:
+            channel_id = int(channel_id)
+            if not self.client.get_channel(channel_id):
+                await interaction.response.send_message("Channel not found.", ephemeral=True)
                 return
-            
-            ticker1, ticker2 = ticker1.upper(), ticker2.upper()
-            guild = self.config.guilds.get(interaction.guild_id)
-            
-            try:
-                channel_id = int(channel_id)
-                if not self.client.get_channel(channel_id):
-                    await interaction.response.send_message("Channel not found.", ephemeral=True)
-                    return
-                
-                # Validate both tickers
-                guild_quoter = PriceQuoteCache(guild.cmc_api_key)
-                try:
-                    crypto_data = await guild_quoter.fetch_no_cache([ticker1, ticker2])
-                    by_symbol = {quote.symbol: quote for quote in crypto_data}
-                    if not (by_symbol.get(ticker1) and by_symbol.get(ticker2)):
-                        await interaction.response.send_message("One or both tickers not found.", ephemeral=True)
-                        return
-                finally:
-                    await guild_quoter.close()
-                
-                pair_key = f"{ticker1}:{ticker2}"
-                guild.ratio_tickers[pair_key] = channel_id
-                save_config(self.config)
-                await interaction.response.send_message(f"Added {pair_key} to <#{channel_id}>", ephemeral=True)
-            except ValueError:
-                await interaction.response.send_message("Invalid channel ID.", ephemeral=True)
-        
-        @self.tree.command(name="remove_message_ratio_tickers", description="Remove ratio ticker")
-        async def remove_message_ratio_tickers(interaction: discord.Interaction, ticker1: str, ticker2: str):
-            if not has_bot_management_permission(interaction, self.config):
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
+
+            # Validate both tickers
+            by_symbol = await self._fetch_validated([ticker1, ticker2], guild.cmc_api_key)
+            if not (by_symbol.get(ticker1) and by_symbol.get(ticker2)):
+                await interaction.response.send_message("One or both tickers not found.", ephemeral=True)
                 return
-            
-            pair_key = f"{ticker1.upper()}:{ticker2.upper()}"
-            guild = self.config.guilds.get(interaction.guild_id)
-            
-            if guild and pair_key in guild.ratio_tickers:
-                del guild.ratio_tickers[pair_key]
-                save_config(self.config)
-                await interaction.response.send_message(f"Removed {pair_key} from ratios.", ephemeral=True)
+
+            guild.ratio_tickers[(ticker1, ticker2)] = channel_id
+            self._save(interaction.guild_id)
+            await interaction.response.send_message(self._MSG_ADDED_RATIO.format(ticker1, ticker2, channel_id), ephemeral=True)
+        except ValueError:
+            await interaction.response.send_message("Invalid channel ID.", ephemeral=True)
+
+    @requires(api=False)
+    async def _cmd_remove_message_ratio_tickers(self, interaction: discord.Interaction, ticker1: str, ticker2: str):
+        ticker1, ticker2 = norm(ticker1), norm(ticker2)
+        guild = self.config.guilds.get(interaction.guild_id)
+
+        if guild and (ticker1, ticker2) in guild.ratio_tickers:
+            del guild.ratio_tickers[(ticker1, ticker2)]
+            self._save(interaction.guild_id)
+            await interaction.response.send_message(self._MSG_REMOVED_RATIO.format(ticker1, ticker2), ephemeral=True)
+        else:
+            await interaction.response.send_message(self._MSG_RATIO_NOT_TRACKED.format(ticker1, ticker2), ephemeral=True)
+
+    @requires()
+    async def _cmd_force_update_tickers(self, interaction: discord.Interaction):
+        await interaction.response.send_message("Updating voice channels...", ephemeral=True)
+        await self.voice_updater.update_voice_channels_for_guild(interaction.guild_id)
+
+    @requires()
+    async def _cmd_force_update_message_tickers(self, interaction: discord.Interaction):
+        await interaction.response.send_message("Updating message tickers...", ephemeral=True)
+        await self.message_updater.update_message_tickers_for_guild(interaction.guild_id, True, False)
+
+    @requires()
+    async def _cmd_force_update_ratio_tickers(self, interaction: discord.Interaction):
+        await interaction.response.send_message("Updating ratio tickers...", ephemeral=True)
+        await self.message_updater.update_message_tickers_for_guild(interaction.guild_id, False, True)
+
+    @requires(api=False)
+    async def _cmd_show_settings(self, interaction: discord.Interaction):
+        # Reuse the embed rendered for the current config version, if any
+        guild_id = interaction.guild_id
+        version = self._settings_version.get(guild_id, 0)
+        cached = self._settings_embed_cache.get(guild_id)
+        if cached is not None and cached[0] == version:
+            # Refresh the timestamp so the reused embed doesn't advertise
+            # its first render time
+            cached[1].timestamp = datetime.now()
+            await interaction.response.send_message(embed=cached[1], ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title="Crypto Bot Settings",
+            description=f"Settings for {interaction.guild.name}",
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+
+        if self.client.user.avatar:
+            embed.set_thumbnail(url=self.client.user.avatar.url)
+
+        guild = self.config.guilds.get(interaction.guild_id)
+        if not guild:
+            embed.add_field(name="Status", value="No settings configured", inline=False)
+            embed.add_field(name="Management Role", value="Not set", inline=False)
+            embed.add_field(name="API Key", value="Not set", inline=False)
+        else:
+            # Add fields
+            embed.add_field(name="Management Role", value=get_management_role_name(interaction, self.config), inline=False)
+            embed.add_field(name="API Key", value="✅ Set" if guild.cmc_api_key else "❌ Not set", inline=False)
+
+            if guild.update_category:
+                category = interaction.guild.get_channel(guild.update_category)
+                category_name = category.name if category else "Unknown"
+                embed.add_field(name="Update Category", value=f"{category_name} ({guild.update_category})", inline=False)
+
+            # Tickers
+            embed.add_field(name="Voice Tickers", value=", ".join(guild.voice_tickers) or "None", inline=False)
+
+            if guild.message_tickers:
+                msg_text = "\n".join([f"**{t}** → <#{c}>" for t, c in guild.message_tickers.items()])
+                embed.add_field(name="Message Tickers", value=msg_text, inline=False)
             else:
-                await interaction.response.send_message(f"Ratio {pair_key} not tracked.", ephemeral=True)
-        
-        # Force update commands
-        @self.tree.command(name="force_update_tickers", description="Force update voice channels")
-        async def force_update_tickers(interaction: discord.Interaction):
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            elif check == "api_key":
-                await interaction.response.send_message("Set API key first with /set_cmc_api_key", ephemeral=True)
-                return
-            
-            await interaction.response.send_message("Updating voice channels...", ephemeral=True)
-            await self.voice_updater.update_voice_channels_for_guild(interaction.guild_id)
-        
-        @self.tree.command(name="force_update_message_tickers", description="Force update message tickers")
-        async def force_update_message_tickers(interaction: discord.Interaction):
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            elif check == "api_key":
-                await interaction.response.send_message("Set API key first with /set_cmc_api_key", ephemeral=True)
-                return
-            
-            await interaction.response.send_message("Updating message tickers...", ephemeral=True)
-            await self.message_updater.update_message_tickers_for_guild(interaction.guild_id, True, False)
-        
-        @self.tree.command(name="force_update_ratio_tickers", description="Force update ratio tickers")
-        async def force_update_ratio_tickers(interaction: discord.Interaction):
-            check = self._check_permissions_and_api(interaction)
-            if check == "permissions":
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            elif check == "api_key":
-                await interaction.response.send_message("Set API key first with /set_cmc_api_key", ephemeral=True)
-                return
-            
-            await interaction.response.send_message("Updating ratio tickers...", ephemeral=True)
-            await self.message_updater.update_message_tickers_for_guild(interaction.guild_id, False, True)
-        
-        @self.tree.command(name="show_settings", description="Show bot settings")
-        async def show_settings(interaction: discord.Interaction):
-            if not has_bot_management_permission(interaction, self.config):
-                await interaction.response.send_message("Bot management permissions required.", ephemeral=True)
-                return
-            
-            embed = discord.Embed(
-                title="Crypto Bot Settings",
-                description=f"Settings for {interaction.guild.name}",
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
-            )
-            
-            if self.client.user.avatar:
-                embed.set_thumbnail(url=self.client.user.avatar.url)
-            
-            guild = self.config.guilds.get(interaction.guild_id)
-            if not guild:
-                embed.add_field(name="Status", value="No settings configured", inline=False)
-                embed.add_field(name="Management Role", value="Not set", inline=False)
-                embed.add_field(name="API Key", value="Not set", inline=False)
+                embed.add_field(name="Message Tickers", value="None", inline=False)
+
+            if guild.ratio_tickers:
+                ratio_text = "\n".join([f"**{a}:{b}** → <#{c}>" for (a, b), c in guild.ratio_tickers.items()])
+                embed.add_field(name="Ratio Tickers", value=ratio_text, inline=False)
             else:
-                # Add fields
-                embed.add_field(name="Management Role", value=get_management_role_name(interaction, self.config), inline=False)
-                embed.add_field(name="API Key", value="✅ Set" if guild.cmc_api_key else "❌ Not set", inline=False)
-                
-                if guild.update_category:
-                    category = discord.utils.get(interaction.guild.categories, id=guild.update_category)
-                    category_name = category.name if category else "Unknown"
-                    embed.add_field(name="Update Category", value=f"{category_name} ({guild.update_category})", inline=False)
-                
-                # Tickers
-                embed.add_field(name="Voice Tickers", value=", ".join(guild.voice_tickers) or "None", inline=False)
-                
-                if guild.message_tickers:
-                    msg_text = "\n".join([f"**{t}** → <#{c}>" for t, c in guild.message_tickers.items()])
-                    embed.add_field(name="Message Tickers", value=msg_text, inline=False)
-                else:
-                    embed.add_field(name="Message Tickers", value="None", inline=False)
-                
-                if guild.ratio_tickers:
-                    ratio_text = "\n".join([f"**{p}** → <#{c}>" for p, c in guild.ratio_tickers.items()])
-                    embed.add_field(name="Ratio Tickers", value=ratio_text, inline=False)
-                else:
-                    embed.add_field(name="Ratio Tickers", value="None", inline=False)
-            
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+                embed.add_field(name="Ratio Tickers", value="None", inline=False)
+
+        self._settings_embed_cache[guild_id] = (version, embed)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
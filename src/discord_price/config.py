@@ -1,13 +1,17 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set, Tuple
 from dataclasses import dataclass, field
-import json
+import asyncio
 import logging
-from .utils import to_all_strings, to_all_ints
+import os
+import sys
+from .utils import json_loads, json_dumps
 
 logger = logging.getLogger(__name__)
 
-# Data storage files
+# Data storage files; DATA_FILE is the legacy single-file layout that is
+# migrated into per-guild files under DATA_DIR on first load
 DATA_FILE = "crypto_bot_data.json"
+DATA_DIR = os.path.join("data", "guilds")
 STYLES_FILE = "crypto_bot_styles.json"
 
 # Default styles structure
@@ -16,17 +20,19 @@ default_styles = {
     "price_down_icon": "📉",
 }
 
-@dataclass
+@dataclass(slots=True)
 class GuildConfiguration:
     id: int
     update_category: Optional[int] = None
-    voice_tickers: List[str] = field(default_factory=list)
-    ratio_tickers: Dict[str, int] = field(default_factory=dict)
+    # Dict used as an ordered set: O(1) membership, insertion order kept
+    voice_tickers: Dict[str, None] = field(default_factory=dict)
+    # Keyed by (ticker1, ticker2); flattened to "T1:T2" only in JSON
+    ratio_tickers: Dict[Tuple[str, str], int] = field(default_factory=dict)
     message_tickers: Dict[str, int] = field(default_factory=dict)
     management_role_id: Optional[int] = None
     cmc_api_key: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Configuration:
     guilds: Dict[int, GuildConfiguration]
 
@@ -36,17 +42,22 @@ def config_from_dict(d: Dict) -> Configuration:
     
     for guild_id_s, guild_data in d.items():
         guild_id = int(guild_id_s)
+        # IDs were historically stored as strings; accept both forms
         update_category = guild_data.get('update_category')
-        if update_category is not None:
+        if isinstance(update_category, str):
             update_category = int(update_category)
-        
+
         management_role_id = guild_data.get('management_role_id')
-        if management_role_id is not None:
+        if isinstance(management_role_id, str):
             management_role_id = int(management_role_id)
         
-        voice_tickers = guild_data.get('voice_tickers', [])
-        ratio_tickers = to_all_ints(guild_data.get('ratio_tickers', {}))
-        message_tickers = to_all_ints(guild_data.get('message_tickers', {}))
+        # Intern tickers so the quote cache's frozenset keys hash and
+        # compare by pointer; commands intern too (see commands.norm)
+        voice_tickers = dict.fromkeys(sys.intern(t) for t in guild_data.get('voice_tickers', []))
+        ratio_tickers = {tuple(sys.intern(t) for t in k.split(':', 1)): int(v) if isinstance(v, str) else v
+                         for k, v in guild_data.get('ratio_tickers', {}).items()}
+        message_tickers = {sys.intern(k): int(v) if isinstance(v, str) else v
+                           for k, v in guild_data.get('message_tickers', {}).items()}
         cmc_api_key = guild_data.get('cmc_api_key')
         
         guilds[guild_id] = GuildConfiguration(
@@ -61,28 +72,29 @@ def config_from_dict(d: Dict) -> Configuration:
     
     return Configuration(guilds=guilds)
 
+def dict_from_guild(guild: GuildConfiguration) -> Dict:
+    """Produce a JSON-compatible dictionary for a single guild"""
+    # Channel/role IDs are written as JSON numbers
+    guild_data = {
+        'message_tickers': guild.message_tickers,
+        'ratio_tickers': {f"{a}:{b}": c for (a, b), c in guild.ratio_tickers.items()},
+        'voice_tickers': list(guild.voice_tickers),
+    }
+
+    if guild.update_category is not None:
+        guild_data['update_category'] = guild.update_category
+
+    if guild.management_role_id is not None:
+        guild_data['management_role_id'] = guild.management_role_id
+
+    if guild.cmc_api_key is not None:
+        guild_data['cmc_api_key'] = guild.cmc_api_key
+
+    return guild_data
+
 def dict_from_config(c: Configuration) -> Dict:
     """Produce a JSON-compatible dictionary from a server configuration"""
-    d = {}
-    for guild in c.guilds.values():
-        guild_data = {
-            'message_tickers': to_all_strings(guild.message_tickers),
-            'ratio_tickers': to_all_strings(guild.ratio_tickers),
-            'voice_tickers': guild.voice_tickers,
-        }
-        
-        if guild.update_category is not None:
-            guild_data['update_category'] = str(guild.update_category)
-        
-        if guild.management_role_id is not None:
-            guild_data['management_role_id'] = str(guild.management_role_id)
-        
-        if guild.cmc_api_key is not None:
-            guild_data['cmc_api_key'] = guild.cmc_api_key
-        
-        d[str(guild.id)] = guild_data
-    
-    return d
+    return {str(guild.id): dict_from_guild(guild) for guild in c.guilds.values()}
 
 def load_styles() -> dict:
     """Load style data from JSON or give reasonable defaults"""
@@ -91,20 +103,93 @@ def load_styles() -> dict:
     return data
 
 def load_config() -> Configuration:
-    """Load bot data from JSON or give reasonable defaults"""
-    data = load_json(DATA_FILE)
-    return config_from_dict(data)
+    """Load bot data from the per-guild files or give reasonable defaults"""
+    if os.path.isdir(DATA_DIR):
+        data = {}
+        for name in os.listdir(DATA_DIR):
+            if name.endswith('.json'):
+                guild_data = load_json(os.path.join(DATA_DIR, name))
+                if guild_data:
+                    data[name[:-len('.json')]] = guild_data
+        return config_from_dict(data)
+
+    # One-shot migration: split a legacy single-file config into per-guild
+    # files; the old file is left in place untouched
+    config = config_from_dict(load_json(DATA_FILE))
+    if config.guilds:
+        logger.info(f"Migrating {len(config.guilds)} guild(s) from {DATA_FILE} to {DATA_DIR}")
+        for guild_id, guild in config.guilds.items():
+            _write_guild_file(guild_id, dict_from_guild(guild))
+    return config
 
 def load_json(path: str) -> dict:
     """Load data from JSON file or fail quietly and return empty dict"""
     try:
-        with open(path, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open(path, 'rb') as f:
+            return json_loads(f.read())
+    except (FileNotFoundError, ValueError):
         return {}
 
-def save_config(c: Configuration):
-    """Save configuration to JSON file"""
-    d = dict_from_config(c)
-    with open(DATA_FILE, 'w') as f:
-        json.dump(d, f, indent=4)
+def _write_guild_file(guild_id: int, data: Dict):
+    """Atomically write one guild's config file"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"{guild_id}.json")
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(json_dumps(data))
+    os.replace(tmp_path, path)
+
+async def save_guild(c: Configuration, guild_id: int):
+    """Write a single guild's file without blocking the event loop"""
+    guild = c.guilds.get(guild_id)
+    if guild is not None:
+        await asyncio.to_thread(_write_guild_file, guild_id, dict_from_guild(guild))
+
+class ConfigWriter:
+    """Debounced, atomic persistence for the bot configuration.
+
+    Command handlers mark a guild dirty instead of writing JSON inline on
+    the event loop; a background task coalesces bursts of changes over a
+    short window and writes only the dirty guilds' files off-thread.
+    """
+    def __init__(self, config: Configuration, debounce: float = 0.5):
+        self.config = config
+        self.debounce = debounce
+        self._dirty: Set[int] = set()
+        self._event = asyncio.Event()
+
+    def save(self, guild_id: int):
+        """Mark a guild dirty and wake the writer task"""
+        self._dirty.add(guild_id)
+        self._event.set()
+
+    async def flush(self):
+        """Write every currently-dirty guild immediately (shutdown path,
+        so debounced changes users were told succeeded aren't lost)"""
+        dirty, self._dirty = self._dirty, set()
+        for guild_id in dirty:
+            try:
+                await save_guild(self.config, guild_id)
+            except Exception as e:
+                logger.error(f"Failed to save guild {guild_id}: {e}")
+
+    async def run(self):
+        """Background task: coalesce dirty marks and write atomically"""
+        while True:
+            await self._event.wait()
+            await asyncio.sleep(self.debounce)
+            self._event.clear()
+            dirty, self._dirty = self._dirty, set()
+            retry = False
+            for guild_id in dirty:
+                try:
+                    await save_guild(self.config, guild_id)
+                except Exception as e:
+                    # Keep the writer alive and re-mark the guild so the
+                    # write is retried on the next wakeup
+                    logger.error(f"Failed to save guild {guild_id}: {e}")
+                    self.save(guild_id)
+                    retry = True
+            if retry:
+                # Back off so a persistent disk error doesn't spin the loop
+                await asyncio.sleep(5.0)
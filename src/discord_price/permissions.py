@@ -1,9 +1,10 @@
-import discord
 from .config import Configuration
 
 def is_server_admin(interaction) -> bool:
     """Check if user has administrator permissions on the server"""
-    return interaction.user.guild_permissions.administrator
+    # interaction.permissions comes precomputed in the interaction payload;
+    # guild_permissions would re-merge every role on each access
+    return interaction.permissions.administrator
 
 def has_bot_management_permission(interaction, config: Configuration) -> bool:
     """
@@ -18,10 +19,11 @@ def has_bot_management_permission(interaction, config: Configuration) -> bool:
     guild_config = config.guilds.get(guild_id)
     
     if guild_config and guild_config.management_role_id:
-        # Check if user has the custom management role
-        management_role = discord.utils.get(interaction.user.roles, id=guild_config.management_role_id)
-        return management_role is not None
-    
+        # Check if user has the custom management role (early-exit scan
+        # instead of discord.utils.get's attribute-matching walk)
+        role_id = guild_config.management_role_id
+        return any(role.id == role_id for role in interaction.user.roles)
+
     return False
 
 def get_management_role_name(interaction, config: Configuration) -> str:
@@ -30,7 +32,8 @@ def get_management_role_name(interaction, config: Configuration) -> str:
     guild_config = config.guilds.get(guild_id)
     
     if guild_config and guild_config.management_role_id:
-        role = discord.utils.get(interaction.guild.roles, id=guild_config.management_role_id)
+        # O(1) lookup on the guild's internal role map
+        role = interaction.guild.get_role(guild_config.management_role_id)
         if role:
             return role.name
         else:
@@ -1,14 +1,25 @@
 import asyncio
 import aiohttp
+import hashlib
+import heapq
+import os
+import pickle
 import time
 import logging
+from bisect import bisect_right
+from collections import OrderedDict
 from typing import List, Dict, Optional
 from dataclasses import dataclass
-from functools import lru_cache
+from .utils import json_loads
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Quote cache snapshots live beside the per-guild config files; named by
+# a digest of the API key so the key itself never lands on disk
+SNAPSHOT_DIR = os.path.join("data", "quotes")
+SNAPSHOT_INTERVAL = 60.0
+
+@dataclass(slots=True, frozen=True)
 class CryptoQuote:
     symbol: str
     name: str
@@ -21,20 +32,70 @@ class CryptoQuote:
     volume_24h: float
     last_updated: str
 
+# Long-lived HTTP sessions and quoters shared across the whole bot, keyed by
+# API key, so keep-alive connections to the CMC API and the in-memory quote
+# cache survive between commands and update ticks
+_sessions: Dict[str, aiohttp.ClientSession] = {}
+_quoters: Dict[str, "PriceQuoteCache"] = {}
+
+def _snapshot_path(api_key: str) -> str:
+    digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f"{digest}.pickle")
+
+def get_quoter(api_key: str) -> "PriceQuoteCache":
+    """Get or create the shared quoter for an API key"""
+    quoter = _quoters.get(api_key)
+    if quoter is None:
+        quoter = _quoters[api_key] = PriceQuoteCache(
+            api_key, snapshot_path=_snapshot_path(api_key))
+    return quoter
+
+async def discard_quoter(api_key: str):
+    """Drop the quoter and close the session cached for an API key.
+
+    Used when a user-supplied key fails validation, so arbitrary typed
+    strings can't accumulate quoters and open sessions in the registries."""
+    _quoters.pop(api_key, None)
+    session = _sessions.pop(api_key, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+async def close_all_sessions():
+    """Close every shared HTTP session (called on shutdown)"""
+    sessions = [s for s in _sessions.values() if not s.closed]
+    _sessions.clear()
+    for session in sessions:
+        await session.close()
+
 class PriceQuoteCache:
-    def __init__(self, api_key: str, cache_ttl: int = 300, max_cache_size: int = 1000):
+    def __init__(self, api_key: str, cache_ttl: int = 300, max_cache_size: int = 1000,
+                 snapshot_path: Optional[str] = None):
         self.api_key = api_key
         self.cache_ttl = cache_ttl
         self.max_cache_size = max_cache_size
-        self.cache: Dict[str, Dict] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.snapshot_path = snapshot_path
+        # Insertion order doubles as expiry order: entries are never
+        # refreshed in place, only re-inserted, so the oldest entry is
+        # always the first to expire
+        self.cache: "OrderedDict[frozenset, Dict]" = OrderedDict()
+        # Min-heap of (expiry time, key); lets cleanup prune only the
+        # entries that have actually expired
+        self._expiry_heap: List[tuple] = []
         self.quotes_endpoint = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
         self.last_request_time = 0
         self.min_request_interval = 1.0
-    
+        self._last_cleanup = 0.0
+        self._snapshot_task = None
+        self._snapshot_dirty = False
+        if snapshot_path:
+            self._load_snapshot()
+
     async def _get_session(self):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
+        session = _sessions.get(self.api_key)
+        if session is None or session.closed:
+            session = _sessions[self.api_key] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, limit_per_host=8,
+                                               keepalive_timeout=75, ttl_dns_cache=300),
                 timeout=aiohttp.ClientTimeout(total=30),
                 headers={
                     'X-CMC_PRO_API_KEY': self.api_key,
@@ -42,26 +103,78 @@ class PriceQuoteCache:
                     'Accept-Encoding': 'deflate, gzip'
                 }
             )
-        return self.session
+        return session
     
-    def _generate_cache_key(self, symbols: List[str]) -> str:
-        return ','.join(sorted(symbols))
+    def _generate_cache_key(self, symbols: List[str]) -> frozenset:
+        # Order-insensitive without sorting; symbols are interned at config
+        # load so hashing compares pointers, not characters
+        return frozenset(symbols)
     
     def _is_cache_valid(self, cache_entry: Dict, current_time: float) -> bool:
         return (current_time - cache_entry['timestamp']) < self.cache_ttl
     
     def _cleanup_cache(self):
         current_time = time.time()
-        # Remove expired entries
-        expired_keys = [k for k, v in self.cache.items() if not self._is_cache_valid(v, current_time)]
-        for key in expired_keys:
-            del self.cache[key]
-        
-        # Enforce size limit
-        if len(self.cache) > self.max_cache_size:
-            sorted_items = sorted(self.cache.items(), key=lambda x: x[1]['timestamp'])
-            for key, _ in sorted_items[:len(self.cache) - self.max_cache_size]:
+        # Throttle: bursts of fetches within one tick share a single pass
+        if current_time - self._last_cleanup < self.min_request_interval:
+            return
+        self._last_cleanup = current_time
+
+        # Pop only entries whose expiry has passed; the staleness guard
+        # skips heap entries superseded by a newer insert of the same key
+        while self._expiry_heap and self._expiry_heap[0][0] < current_time:
+            _, key = heapq.heappop(self._expiry_heap)
+            entry = self.cache.get(key)
+            if entry and entry['timestamp'] + self.cache_ttl <= current_time:
                 del self.cache[key]
+
+        # Enforce size limit, oldest first
+        while len(self.cache) > self.max_cache_size:
+            self.cache.popitem(last=False)
+
+    def _load_snapshot(self):
+        """Warm the cache from the last on-disk snapshot, dropping expired
+        entries, so a restart doesn't re-spend CMC quota on the first tick"""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError):
+            # Missing file or a snapshot from an older CryptoQuote layout;
+            # start cold either way
+            return
+
+        current_time = time.time()
+        for key, entry in sorted(snapshot.items(), key=lambda item: item[1]['timestamp']):
+            if self._is_cache_valid(entry, current_time):
+                self.cache[key] = entry
+                heapq.heappush(self._expiry_heap, (entry['timestamp'] + self.cache_ttl, key))
+        if self.cache:
+            logger.info(f"Loaded {len(self.cache)} cached quote set(s) from snapshot")
+
+    def _write_snapshot(self, snapshot: Dict):
+        """Atomically write a cache copy to disk (runs off-loop)"""
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def _snapshot_loop(self):
+        """Background task: periodically snapshot the cache when it changed"""
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            if not self._snapshot_dirty:
+                continue
+            self._snapshot_dirty = False
+            # Copy on the event loop so the worker thread never iterates
+            # the live dict while fetches mutate it
+            snapshot = dict(self.cache)
+            try:
+                await asyncio.to_thread(self._write_snapshot, snapshot)
+            except Exception as e:
+                # Leave the dirty flag set so the next interval retries
+                logger.error(f"Failed to write quote snapshot: {e}")
+                self._snapshot_dirty = True
     
     async def _rate_limit(self):
         current_time = time.time()
@@ -77,8 +190,11 @@ class PriceQuoteCache:
         try:
             async with session.get(self.quotes_endpoint, params={'symbol': ','.join(symbols), 'convert': 'USD'}) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    return self._parse_api_response(data)
+                    # Read raw bytes and parse with the shared json_loads
+                    # (orjson when available) rather than response.json()'s
+                    # stdlib decode
+                    body = await response.read()
+                    return self._parse_api_response(json_loads(body))
                 elif response.status == 429:
                     logger.warning("API rate limit hit")
                     await asyncio.sleep(60)
@@ -91,33 +207,35 @@ class PriceQuoteCache:
             logger.error(f"Network error: {e}")
             raise Exception(f"Network error: {e}")
     
+    @staticmethod
+    def _quote_from_entry(info: Dict) -> CryptoQuote:
+        # Direct indexing: a missing field is an API contract change and
+        # surfaces as KeyError instead of being silently defaulted to 0
+        quote_data = info['quote']['USD']
+        return CryptoQuote(
+            symbol=info['symbol'],
+            name=info['name'],
+            slug=info['slug'],
+            price_usd=float(quote_data['price']),
+            percent_change_1h=float(quote_data['percent_change_1h']),
+            percent_change_24h=float(quote_data['percent_change_24h']),
+            percent_change_7d=float(quote_data['percent_change_7d']),
+            market_cap=float(quote_data['market_cap']),
+            volume_24h=float(quote_data['volume_24h']),
+            last_updated=quote_data['last_updated']
+        )
+
     def _parse_api_response(self, data: Dict) -> List[CryptoQuote]:
-        quotes = []
         try:
-            for symbol, info in data.get('data', {}).items():
-                quote_data = info.get('quote', {}).get('USD', {})
-                quotes.append(CryptoQuote(
-                    symbol=info.get('symbol', ''),
-                    name=info.get('name', ''),
-                    slug=info.get('slug', ''),
-                    price_usd=float(quote_data.get('price', 0)),
-                    percent_change_1h=float(quote_data.get('percent_change_1h', 0)),
-                    percent_change_24h=float(quote_data.get('percent_change_24h', 0)),
-                    percent_change_7d=float(quote_data.get('percent_change_7d', 0)),
-                    market_cap=float(quote_data.get('market_cap', 0)),
-                    volume_24h=float(quote_data.get('volume_24h', 0)),
-                    last_updated=quote_data.get('last_updated', '')
-                ))
+            return [self._quote_from_entry(info) for info in data.get('data', {}).values()]
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Error parsing API response: {e}")
             raise Exception(f"Failed to parse API response: {e}")
-        return quotes
     
     async def fetch(self, symbols: List[str], current_time: float) -> List[CryptoQuote]:
         if not symbols:
             return []
-        
-        self._cleanup_cache()
+
         cache_key = self._generate_cache_key(symbols)
         
         # Check cache
@@ -128,6 +246,17 @@ class PriceQuoteCache:
         try:
             quotes = await self._fetch_from_api(symbols)
             self.cache[cache_key] = {'data': quotes, 'timestamp': current_time}
+            # Re-inserting an existing key keeps its old position; push it
+            # to the fresh end so order stays expiry-sorted
+            self.cache.move_to_end(cache_key)
+            heapq.heappush(self._expiry_heap, (current_time + self.cache_ttl, cache_key))
+            # Only inserts can grow the cache, so only inserts clean it;
+            # hits return without touching the rest of the structure
+            self._cleanup_cache()
+            if self.snapshot_path:
+                self._snapshot_dirty = True
+                if self._snapshot_task is None:
+                    self._snapshot_task = asyncio.create_task(self._snapshot_loop())
             return quotes
         except Exception as e:
             # Return stale cache if available
@@ -137,21 +266,30 @@ class PriceQuoteCache:
             logger.error(f"No cache available: {e}")
             return []
     
+    async def fetch_many(self, symbol_sets: List[List[str]], current_time: float) -> Dict[str, CryptoQuote]:
+        """Fetch the union of several symbol lists in one request and return
+        the quotes indexed by symbol"""
+        symbols = set().union(*symbol_sets) if symbol_sets else set()
+        quotes = await self.fetch(list(symbols), current_time)
+        return {quote.symbol: quote for quote in quotes}
+
     async def fetch_no_cache(self, symbols: List[str]) -> List[CryptoQuote]:
         return await self._fetch_from_api(symbols) if symbols else []
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # The HTTP session is shared (see close_all_sessions); only drop
+        # this quoter's cached quotes
         self.cache.clear()
+        self._expiry_heap.clear()
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+
+# Precision tiers for format_price: prices below each threshold in
+# _THRESH use the format at the same index in _FMT
+_THRESH = (0.01, 1.0, 1000.0)
+_FMT = ('${:.6f}', '${:.4f}', '${:.2f}', '${:.0f}')
 
-@lru_cache(maxsize=128)
 def format_price(price: float) -> str:
-    if price < 0.01:
-        return f"${price:.6f}"
-    elif price < 1:
-        return f"${price:.4f}"
-    elif price < 1000:
-        return f"${price:.2f}"
-    else:
-        return f"${price:.0f}"
+    # bisect_right keeps the original strict '<' tier boundaries
+    return _FMT[bisect_right(_THRESH, price)].format(price)
@@ -1,12 +1,18 @@
 import asyncio
 import time
 import logging
+from operator import attrgetter
 import discord
 from .config import Configuration
-from .quote import PriceQuoteCache
+from .quote import get_quoter, format_price
 
 logger = logging.getLogger(__name__)
 
+# Cap on concurrent per-guild updates. Quotes are prefetched before the
+# fan-out, so these coroutines only issue Discord REST calls; the cap just
+# keeps a large guild list from flooding discord.py's rate-limit queue
+MAX_CONCURRENT_GUILD_UPDATES = 10
+
 class BaseUpdater:
     def __init__(self, client, config, price_quoter):
         self.client = client
@@ -16,17 +22,60 @@ class BaseUpdater:
     async def boundary_timer(self, cadence: int, name: str):
         now = time.time()
         next_boundary = cadence - (now % cadence)
-        logger.info(f"Sleeping {next_boundary:.1f}s until next {name} boundary")
+        # Guard the f-string so suppressed levels don't pay to format it
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Sleeping {next_boundary:.1f}s until next {name} boundary")
         await asyncio.sleep(next_boundary)
         
         while self.client.is_closed():
             logger.info(f"Retrying {name} update; client disconnected")
             await asyncio.sleep(180)
 
+    async def prefetch_quotes(self, symbols_for_guild):
+        """Coalesce all guilds' symbols into one CMC request per API key.
+
+        symbols_for_guild maps a guild config to the symbols it needs for
+        this tick. Returns {api_key: {symbol: quote}}; overlapping symbols
+        across guilds cost nothing extra and every guild on the same key
+        sees quotes from the same timestamp.
+        """
+        symbol_sets = {}
+        for guild_config in self.config.guilds.values():
+            if not guild_config.cmc_api_key:
+                continue
+            symbols = symbols_for_guild(guild_config)
+            if symbols:
+                symbol_sets.setdefault(guild_config.cmc_api_key, []).append(symbols)
+
+        current_time = time.time()
+        prefetched = {}
+        for api_key, sets in symbol_sets.items():
+            prefetched[api_key] = await get_quoter(api_key).fetch_many(sets, current_time)
+        return prefetched
+
+    async def for_each_guild(self, update_one, name: str):
+        """Run a per-guild update coroutine for every guild concurrently,
+        bounded by a semaphore, logging failures instead of aborting the tick"""
+        sem = asyncio.Semaphore(MAX_CONCURRENT_GUILD_UPDATES)
+
+        async def _one(guild_config):
+            async with sem:
+                await update_one(guild_config)
+
+        results = await asyncio.gather(
+            *(_one(gc) for gc in self.config.guilds.values()),
+            return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"{name} update failed for a guild: {result}")
+
 class VoiceChannelUpdater(BaseUpdater):
     def __init__(self, client, config, styles, price_quoter):
         super().__init__(client, config, price_quoter)
         self.styles = styles
+        # Last (names, ranks) written per guild; unchanged symbols skip
+        # their Discord edits entirely on the next tick
+        self._last_state = {}
     
     async def update_loop(self):
         logger.info("Voice update loop starting")
@@ -37,24 +86,39 @@ class VoiceChannelUpdater(BaseUpdater):
             await self.update_all_voice_channels()
     
     async def update_all_voice_channels(self):
-        for guild_config in self.config.guilds.values():
-            await self.update_voice_channels_for_guild(guild_config.id)
-    
-    def _format_price(self, price: float) -> str:
-        """Format price based on its value"""
-        if price < 0.01:
-            return f"${price:.6f}"
-        elif price < 1:
-            return f"${price:.4f}"
-        elif price < 1000:
-            return f"${price:.2f}"
-        else:
-            return f"${price:.0f}"
+        prefetched = await self.prefetch_quotes(
+            lambda gc: list(gc.voice_tickers) if gc.update_category else [])
+        ticks = {api_key: self._build_tick(quotes_by_symbol)
+                 for api_key, quotes_by_symbol in prefetched.items()}
+
+        async def update_one(guild_config):
+            await self.update_voice_channels_for_guild(
+                guild_config.id, ticks.get(guild_config.cmc_api_key))
+
+        await self.for_each_guild(update_one, "voice")
+
+    def _build_tick(self, quotes_by_symbol):
+        """Rank and name every fetched quote once per tick.
+
+        Guilds sharing an API key overlap heavily in symbols; sorting and
+        string formatting happen here so the per-guild pass only filters
+        the ranked list and looks names up."""
+        ranked = sorted(quotes_by_symbol.values(),
+                        key=attrgetter('market_cap'), reverse=True)
+        up_icon = self.styles['price_up_icon']
+        down_icon = self.styles['price_down_icon']
+        name_of = {q.symbol: self._create_channel_name(q, up_icon, down_icon)
+                   for q in ranked}
+        return ranked, name_of
     
-    def _create_channel_name(self, quote) -> str:
-        """Create channel name from quote data"""
-        emoji = self.styles['price_up_icon' if quote.percent_change_1h >= 0 else 'price_down_icon']
-        price_str = self._format_price(quote.price_usd)
+    def _create_channel_name(self, quote, up_icon=None, down_icon=None) -> str:
+        """Create channel name from quote data; icon arguments let hot loops
+        hoist the style lookups out of the per-quote path"""
+        if up_icon is None:
+            up_icon = self.styles['price_up_icon']
+            down_icon = self.styles['price_down_icon']
+        emoji = up_icon if quote.percent_change_1h >= 0 else down_icon
+        price_str = format_price(quote.price_usd)
         return f"{quote.symbol} {emoji} {price_str}"
     
     async def add_voice_ticker(self, guild_id: int, ticker: str):
@@ -67,58 +131,41 @@ class VoiceChannelUpdater(BaseUpdater):
         if not guild:
             return
         
-        category = discord.utils.get(guild.categories, id=guild_config.update_category)
-        if not category:
+        category = guild.get_channel(guild_config.update_category)
+        if not isinstance(category, discord.CategoryChannel):
             return
         
-        guild_quoter = PriceQuoteCache(guild_config.cmc_api_key)
-        try:
-            # Get quotes for ALL tickers including the new one
-            all_quotes = await guild_quoter.fetch(guild_config.voice_tickers, time.time())
-            if not all_quotes:
-                return
-            
-            # Sort all quotes by market cap (highest first)
-            sorted_quotes = sorted(all_quotes, key=lambda x: x.market_cap, reverse=True)
-            
-            # Find the new ticker's quote and position
-            new_quote = None
-            target_position = 0
-            
-            for i, quote in enumerate(sorted_quotes):
-                if quote.symbol == ticker:
-                    new_quote = quote
-                    target_position = i
-                    break
-            
-            if not new_quote:
-                return
-            
-            # Create the channel name
-            channel_name = self._create_channel_name(new_quote)
-            
-            # Create the new channel at the end first
-            new_channel = await category.create_voice_channel(name=channel_name)
-            
-            # Now move it to the correct position
-            # We need to account for existing channels and find the right spot
-            existing_channels = [ch for ch in category.voice_channels if ch.id != new_channel.id]
-            
-            # If we need to be at position 0, move to top
-            if target_position == 0:
-                await new_channel.edit(position=0)
-            else:
-                # Find the channel that should be right before us
-                channels_before = target_position
-                if channels_before < len(existing_channels):
-                    # Move after the channel that should be before us
-                    await new_channel.edit(position=existing_channels[channels_before - 1].position + 1)
-                # If we're supposed to be at the end, we're already there
-            
-            logger.info(f"Added voice channel for {ticker} at position {target_position} in guild {guild_id}")
-            
-        finally:
-            await guild_quoter.close()
+        guild_quoter = get_quoter(guild_config.cmc_api_key)
+        # Get quotes for ALL tickers including the new one
+        all_quotes = await guild_quoter.fetch(list(guild_config.voice_tickers), time.time())
+        if not all_quotes:
+            return
+        
+        # Sort all quotes by market cap (highest first)
+        sorted_quotes = sorted(all_quotes, key=attrgetter('market_cap'), reverse=True)
+        
+        # Find the new ticker's quote and position
+        new_quote = None
+        target_position = 0
+        
+        for i, quote in enumerate(sorted_quotes):
+            if quote.symbol == ticker:
+                new_quote = quote
+                target_position = i
+                break
+        
+        if not new_quote:
+            return
+        
+        # Create the channel name
+        channel_name = self._create_channel_name(new_quote)
+
+        # Create directly at the target position: one request instead of
+        # create-then-edit, and no stale position math after the server
+        # renumbers on create
+        await category.create_voice_channel(name=channel_name, position=target_position)
+
+        logger.info(f"Added voice channel for {ticker} at position {target_position} in guild {guild_id}")
     
     async def remove_voice_ticker(self, guild_id: int, ticker: str):
         """Remove a single voice ticker's channel"""
@@ -130,84 +177,97 @@ class VoiceChannelUpdater(BaseUpdater):
         if not guild:
             return
         
-        category = discord.utils.get(guild.categories, id=guild_config.update_category)
-        if not category:
+        category = guild.get_channel(guild_config.update_category)
+        if not isinstance(category, discord.CategoryChannel):
             return
         
         # Find and delete the channel for this ticker
         for channel in category.voice_channels:
-            # Extract ticker symbol from channel name (format: "SYMBOL emoji $price")
-            channel_parts = channel.name.split(' ')
-            if channel_parts and channel_parts[0] == ticker:
+            # Extract ticker symbol from channel name (format: "SYMBOL emoji $price");
+            # partition stops at the first space and skips the list allocation
+            if channel.name.partition(' ')[0] == ticker:
                 await channel.delete()
                 logger.info(f"Removed voice channel for {ticker} in guild {guild_id}")
                 break
     
-    async def update_voice_channels_for_guild(self, guild_id: int):
-        """Update voice channels for a specific guild - full refresh for scheduled updates"""
+    async def update_voice_channels_for_guild(self, guild_id: int, tick=None):
+        """Update voice channels for a specific guild - full refresh for scheduled updates.
+
+        tick is the (ranked quotes, {symbol: channel name}) pair built once
+        per batched tick; when None (force updates), the guild fetches and
+        ranks its own symbols."""
         guild_config = self.config.guilds.get(guild_id)
-        if not (guild_config and guild_config.update_category and 
+        if not (guild_config and guild_config.update_category and
                 guild_config.voice_tickers and guild_config.cmc_api_key):
             return
-        
+
         guild = self.client.get_guild(guild_id)
         if not guild:
             logger.warning(f"Guild {guild_id} not found")
             return
-        
-        category = discord.utils.get(guild.categories, id=guild_config.update_category)
-        if not category:
+
+        category = guild.get_channel(guild_config.update_category)
+        if not isinstance(category, discord.CategoryChannel):
+            return
+
+        if tick is None:
+            guild_quoter = get_quoter(guild_config.cmc_api_key)
+            quotes_by_symbol = await guild_quoter.fetch_many([list(guild_config.voice_tickers)], time.time())
+            tick = self._build_tick(quotes_by_symbol)
+        ranked, name_of = tick
+        # Filter the shared ranked list down to this guild's tickers; the
+        # global market-cap order is also the per-guild order
+        sorted_quotes = [q for q in ranked if q.symbol in guild_config.voice_tickers]
+        if not sorted_quotes:
             return
+
+        # Get existing channels mapped by symbol (first space-separated token)
+        existing_channels = {channel.name.partition(' ')[0]: channel
+                             for channel in category.voice_channels}
+
+        # Track channels we've processed
+        processed_channels = set()
+
+        # What we wrote last tick; a symbol whose name and rank both match
+        # costs zero Discord requests this tick (PATCHes spend rate-limit
+        # tokens even when the payload is a no-op)
+        prev_names, prev_ranks = self._last_state.get(guild_id, ({}, {}))
+        names = {}
+        ranks = {}
+
+        # Update existing channels and create new ones in correct order
+        for i, quote in enumerate(sorted_quotes):
+            symbol = quote.symbol
+            channel_name = name_of[symbol]
+            names[symbol] = channel_name
+            ranks[symbol] = i
+            processed_channels.add(symbol)
+
+            if symbol in existing_channels:
+                if prev_names.get(symbol) == channel_name and prev_ranks.get(symbol) == i:
+                    continue
+
+                # Update existing channel; batch name and position changes
+                # into one edit so each channel costs at most one API call
+                existing_channel = existing_channels[symbol]
+
+                kwargs = {}
+                if existing_channel.name != channel_name:
+                    kwargs['name'] = channel_name
+                if existing_channel.position != i:
+                    kwargs['position'] = i
+                if kwargs:
+                    await existing_channel.edit(**kwargs)
+            else:
+                # Create new channel at correct position
+                await category.create_voice_channel(name=channel_name, position=i)
+
+        self._last_state[guild_id] = (names, ranks)
         
-        guild_quoter = PriceQuoteCache(guild_config.cmc_api_key)
-        try:
-            quotes = await guild_quoter.fetch(guild_config.voice_tickers, time.time())
-            if not quotes:
-                return
-            
-            # Get existing channels mapped by symbol
-            existing_channels = {}
-            for channel in category.voice_channels:
-                channel_parts = channel.name.split(' ')
-                if channel_parts:
-                    symbol = channel_parts[0]
-                    existing_channels[symbol] = channel
-            
-            # Sort quotes by market cap (highest first)
-            sorted_quotes = sorted(quotes, key=lambda x: x.market_cap, reverse=True)
-            
-            # Track channels we've processed
-            processed_channels = set()
-            
-            # Update existing channels and create new ones in correct order
-            for i, quote in enumerate(sorted_quotes):
-                channel_name = self._create_channel_name(quote)
-                
-                if quote.symbol in existing_channels:
-                    # Update existing channel
-                    existing_channel = existing_channels[quote.symbol]
-                    
-                    # Update name if needed
-                    if existing_channel.name != channel_name:
-                        await existing_channel.edit(name=channel_name)
-                    
-                    # Update position if needed
-                    if existing_channel.position != i:
-                        await existing_channel.edit(position=i)
-                    
-                    processed_channels.add(quote.symbol)
-                else:
-                    # Create new channel at correct position
-                    await category.create_voice_channel(name=channel_name, position=i)
-                    processed_channels.add(quote.symbol)
-            
-            # Delete channels for tickers that are no longer tracked
-            for symbol, channel in existing_channels.items():
-                if symbol not in processed_channels:
-                    await channel.delete()
-                    
-        finally:
-            await guild_quoter.close()
+        # Delete channels for tickers that are no longer tracked
+        for symbol, channel in existing_channels.items():
+            if symbol not in processed_channels:
+                await channel.delete()
 
 class MessageTickerUpdater(BaseUpdater):
     async def update_loop(self):
@@ -218,36 +278,50 @@ class MessageTickerUpdater(BaseUpdater):
             await self.boundary_timer(1800, "message")
             await self.update_all_message_tickers()
     
+    @staticmethod
+    def _symbols_for_guild(guild_config, do_regulars=True, do_ratios=True):
+        """Collect every symbol a guild's message/ratio tickers need"""
+        symbols = []
+        if do_regulars:
+            symbols.extend(guild_config.message_tickers)
+        if do_ratios:
+            for ticker1, ticker2 in guild_config.ratio_tickers:
+                symbols.append(ticker1)
+                symbols.append(ticker2)
+        return symbols
+
     async def update_all_message_tickers(self, do_regulars=True, do_ratios=True):
-        for guild_config in self.config.guilds.values():
-            await self.update_message_tickers_for_guild(guild_config.id, do_regulars, do_ratios)
-    
-    async def update_message_tickers_for_guild(self, guild_id: int, do_regulars=True, do_ratios=True):
+        prefetched = await self.prefetch_quotes(
+            lambda gc: self._symbols_for_guild(gc, do_regulars, do_ratios))
+
+        async def update_one(guild_config):
+            await self.update_message_tickers_for_guild(
+                guild_config.id, do_regulars, do_ratios, prefetched.get(guild_config.cmc_api_key))
+
+        await self.for_each_guild(update_one, "message")
+
+    async def update_message_tickers_for_guild(self, guild_id: int, do_regulars=True, do_ratios=True, prefetched=None):
         guild_config = self.config.guilds.get(guild_id)
         if not (guild_config and guild_config.cmc_api_key):
             return
-        
+
         guild = self.client.get_guild(guild_id)
         if not guild:
             return
-        
-        guild_quoter = PriceQuoteCache(guild_config.cmc_api_key)
-        try:
-            if do_regulars:
-                await self._update_regular_tickers(guild_config, guild_quoter)
-            if do_ratios:
-                await self._update_ratio_tickers(guild_config, guild_quoter)
-        finally:
-            await guild_quoter.close()
-    
-    async def _update_regular_tickers(self, guild_config, guild_quoter):
+
+        if prefetched is None:
+            guild_quoter = get_quoter(guild_config.cmc_api_key)
+            symbols = self._symbols_for_guild(guild_config, do_regulars, do_ratios)
+            prefetched = await guild_quoter.fetch_many([symbols], time.time())
+        if do_regulars:
+            await self._update_regular_tickers(guild_config, prefetched)
+        if do_ratios:
+            await self._update_ratio_tickers(guild_config, prefetched)
+
+    async def _update_regular_tickers(self, guild_config, quotes_by_symbol):
         if not guild_config.message_tickers:
             return
-        
-        symbols = list(guild_config.message_tickers.keys())
-        quotes = await guild_quoter.fetch(symbols, time.time())
-        quotes_by_symbol = {quote.symbol: quote for quote in quotes}
-        
+
         for symbol, channel_id in guild_config.message_tickers.items():
             quote = quotes_by_symbol.get(symbol)
             if not quote:
@@ -260,15 +334,12 @@ class MessageTickerUpdater(BaseUpdater):
             message = f"The price of {quote.name} ({symbol}) is ${quote.price_usd:.2f} USD on [CMC](<https://coinmarketcap.com/currencies/{quote.slug}/>)"
             await channel.send(message)
     
-    async def _update_ratio_tickers(self, guild_config, guild_quoter):
+    async def _update_ratio_tickers(self, guild_config, quotes_by_symbol):
         if not guild_config.ratio_tickers:
             return
-        
+
         for pair, channel_id in guild_config.ratio_tickers.items():
-            ticker1, ticker2 = pair.split(":")
-            quotes = await guild_quoter.fetch([ticker1, ticker2], time.time())
-            quotes_by_symbol = {quote.symbol: quote for quote in quotes}
-            
+            ticker1, ticker2 = pair
             a, b = quotes_by_symbol.get(ticker1), quotes_by_symbol.get(ticker2)
             if not (a and b):
                 continue
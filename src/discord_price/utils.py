@@ -1,14 +1,67 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
 from datetime import datetime, timezone
 
-def get_utc_time():
-    """Format current time in UTC"""
-    now = datetime.now(timezone.utc)
-    return now.strftime("%I:%M %p UTC")
+LOG_FORMAT = '%(asctime)s.%(msecs)03d %(name)-6s:[%(levelname)-8s] %(message)s'
+LOG_DATEFMT = '%Y-%m-%dT%H:%M:%S'
+
+def setup_logging(level=logging.INFO) -> logging.handlers.QueueListener:
+    """Configure root logging through a queue.
+
+    Handler I/O (stderr writes) happens on a background listener thread,
+    so a logger call from async code is just a non-blocking enqueue and
+    never stalls the event loop. Returns the started listener."""
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATEFMT))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    # Drain the queue on interpreter exit; the listener thread is a
+    # daemon, so without this the final shutdown lines could be dropped
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    return listener
+
+# Prefer orjson for JSON encode/decode (~3-5x faster than stdlib and emits
+# compact output); fall back to stdlib json if it isn't installed.
+try:
+    import orjson
 
-def to_all_strings(d: dict) -> dict:
-    """Convert dictionary of strings->ints into strings->decimal-integer-strings"""
-    return {k: str(v) for k, v in d.items()}
+    def json_loads(data):
+        """Parse JSON from bytes or str"""
+        return orjson.loads(data)
 
-def to_all_ints(d: dict) -> dict:
-    """Convert dictionary of strings->decimal-integer-strings into strings->ints"""
-    return {k: int(v) for k, v in d.items()}
+    def json_dumps(obj) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def json_loads(data):
+        """Parse JSON from bytes or str"""
+        return json.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# get_utc_time only has minute precision, so the formatted string is
+# memoized per minute and reused until the minute ticks over
+_last_minute = 0
+_last_time_str = ''
+
+def get_utc_time():
+    """Format current time in UTC"""
+    global _last_minute, _last_time_str
+    minute = int(time.time() // 60)
+    if minute != _last_minute:
+        _last_minute = minute
+        _last_time_str = datetime.now(timezone.utc).strftime("%I:%M %p UTC")
+    return _last_time_str
@@ -1,18 +1,13 @@
 import logging
 from discord_price.bot import CryptoPriceBot
 from discord_price.config import load_config, load_styles
-from discord_price.quote import PriceQuoteCache
+from discord_price.utils import setup_logging
 import os
 from dotenv import load_dotenv
 import sys
 
-# Configure logging
-logformat = '%(asctime)s.%(msecs)03d %(name)-6s:[%(levelname)-8s] %(message)s'
-logging.basicConfig(
-    format=logformat,
-    datefmt='%Y-%m-%dT%H:%M:%S',
-    level=logging.INFO
-)
+# Configure logging (queue-backed so handler I/O stays off the event loop)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +25,9 @@ def main():
     # Initialize components
     config = load_config()
     styles = load_styles()
-    
-    # Create a dummy price quoter (won't be used since each guild has its own)
-    price_quoter = PriceQuoteCache("dummy_key")
-    
-    # Create and run bot
-    bot = CryptoPriceBot(config, styles, price_quoter)
+
+    # Create and run bot (each guild creates its own quoter on demand)
+    bot = CryptoPriceBot(config, styles)
     bot.run(discord_token)
 
 if __name__ == "__main__":